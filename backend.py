@@ -1,33 +1,170 @@
+import math
 import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
+
+# Transaction types are stored as small integers; the API speaks in names
+_TYPE_CODES = {'income': 0, 'expense': 1}
+
+# Column list for transaction SELECTs, decoding type back to its name and
+# amount_cents back to a float amount
+_TRANSACTION_COLUMNS = """
+    id, amount_cents / 100.0 AS amount,
+    CASE type WHEN 0 THEN 'income' ELSE 'expense' END AS type,
+    remarks, date, created_at
+"""
+
+
+def _to_cents(amount: float) -> int:
+    """Convert an amount to whole cents as stored in the database"""
+    return int(round(amount * 100))
+
+
+def normalize_date(value) -> Optional[str]:
+    """Return value as a zero-padded YYYY-MM-DD string, or None if it is not a valid date.
+    Accepts date/datetime objects, '/' separators, unpadded parts and a trailing time."""
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")
+    text = str(value).strip().replace("/", "-").partition(" ")[0]
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _checked_date(value) -> str:
+    """normalize_date() for writes: month buckets (ym) need zero-padded dates"""
+    date = normalize_date(value)
+    if date is None:
+        raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+    return date
 
 class DatabaseConnection:
     """Database connection manager"""
     
+    # Bumped whenever the transactions table layout changes; stored in
+    # PRAGMA user_version so older files are rebuilt on open
+    SCHEMA_VERSION = 6
+    
     def __init__(self, db_path: str = "finance.db"):
         self.db_path = db_path
+        # Single long-lived connection shared by every FinanceManager call.
+        # Autocommit mode: each statement is its own transaction.
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        # Rows are built in C and support both index and name access
+        self.conn.row_factory = sqlite3.Row
+        self._configure()
         self._create_tables()
+        # Refresh planner statistics if SQLite thinks they are stale
+        self.conn.execute("PRAGMA optimize")
+    
+    def _configure(self):
+        """Apply connection-level PRAGMAs once"""
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")      # ~64 MB page cache
+        cursor.execute("PRAGMA mmap_size=134217728")    # 128 MB memory map
+    
+    def _transactions_ddl(self, table: str) -> str:
+        """CREATE TABLE statement for the current transactions schema"""
+        # id is the rowid alias; no AUTOINCREMENT, which would add a
+        # sqlite_sequence write to every insert
+        return f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                amount_cents INTEGER NOT NULL,
+                type INTEGER CHECK(type IN (0, 1)) NOT NULL,    -- 0 income, 1 expense
+                remarks TEXT,
+                date TEXT NOT NULL DEFAULT (date('now', 'localtime')),
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                ym TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) STORED    -- 'YYYY-MM'
+            )
+        """
     
     def _create_tables(self):
         """Create necessary tables if they don't exist"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        cursor = self.conn.cursor()
+        
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'")
+        exists = cursor.fetchone() is not None
+        
+        if exists and version < self.SCHEMA_VERSION:
+            self._rebuild_transactions()
+        else:
             # Simple transactions table with type (income/expense)
+            cursor.execute(self._transactions_ddl("transactions"))
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        # Totals/summaries filter by type and a date range; listings by date
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_txn_type_date ON transactions(type, date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_txn_date ON transactions(date)")
+        # Monthly series: GROUP BY ym walks this index in order, no sort step
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_txn_ym_type ON transactions(ym, type)")
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements in one BEGIN ... COMMIT, rolling back on
+        error. Nested use joins the outer transaction."""
+        cursor = self.conn.cursor()
+        if self.conn.in_transaction:
+            yield cursor
+            return
+        cursor.execute("BEGIN")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+    
+    def _rebuild_transactions(self):
+        """Copy rows from an older schema into a fresh table and swap it in"""
+        with self.transaction() as cursor:
+            cursor.execute("PRAGMA table_info(transactions)")
+            columns = {row[1] for row in cursor.fetchall()}
+            if "amount_cents" in columns:
+                amount_cents = "amount_cents"
+            else:
+                amount_cents = "CAST(ROUND(amount * 100) AS INTEGER)"
+            
+            cursor.execute("DROP TABLE IF EXISTS transactions_new")
+            cursor.execute(self._transactions_ddl("transactions_new"))
+            cursor.execute(f"""
+                INSERT INTO transactions_new (id, amount_cents, type, remarks, date, created_at)
+                SELECT id, {amount_cents},
+                       CASE type WHEN 'income' THEN 0 WHEN 'expense' THEN 1 ELSE type END,
+                       remarks, date, created_at
+                FROM transactions
+            """)
+            # Older versions stored dates as typed (e.g. '2024-1-9'), which
+            # would give bogus ym buckets; rewrite them zero-padded
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS transactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    amount REAL NOT NULL,
-                    type TEXT CHECK(type IN ('income', 'expense')) NOT NULL,
-                    remarks TEXT,
-                    date TEXT NOT NULL,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
+                SELECT id, date FROM transactions_new
+                WHERE date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
             """)
-            
-            conn.commit()
+            fixed = [
+                (date, row_id) for row_id, date in
+                ((row[0], normalize_date(row[1])) for row in cursor.fetchall())
+                if date is not None
+            ]
+            cursor.executemany("UPDATE transactions_new SET date = ? WHERE id = ?", fixed)
+            # Dropping the old table also drops its indexes and sqlite_sequence entry
+            cursor.execute("DROP TABLE transactions")
+            cursor.execute("ALTER TABLE transactions_new RENAME TO transactions")
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+    
+    def close(self):
+        """Close the underlying connection"""
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
 
 class Transaction:
     """Transaction class representing financial transactions"""
@@ -47,219 +184,448 @@ class Transaction:
 class FinanceManager:
     """Main finance management class"""
     
+    # Rows written before statistics are refreshed with ANALYZE
+    ANALYZE_THRESHOLD = 1000
+    
     def __init__(self, db_path: str = "finance.db"):
         self.db = DatabaseConnection(db_path)
         self.db_path = db_path
+        # Serialises access to the shared connection across threads
+        self._lock = threading.RLock()
+        
+        # Running totals in cents, kept in step with every write, so balance
+        # and summaries never re-aggregate the table. 'YYYY-MM' -> [income, expense]
+        self._income_total = 0
+        self._expense_total = 0
+        self._monthly = defaultdict(lambda: [0, 0])
+        self._load_totals()
+        
+        self._writes_since_analyze = 0
     
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get the shared database connection"""
+        return self.db.conn
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self.db.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one explicit transaction (one commit):
+        
+            with fm.transaction() as cursor:
+                ...
+        """
+        with self._lock:
+            try:
+                with self.db.transaction() as cursor:
+                    yield cursor
+            except BaseException:
+                # Writes inside the block already moved the running totals;
+                # re-read them from whatever the rollback left in the table
+                self._load_totals()
+                raise
     
-    def add_transaction(self, amount: float, type: str, remarks: str = "", date: str = None) -> bool:
-        """Add a new transaction (income or expense)"""
+    def _note_writes(self, count: int):
+        """Count written rows; after ANALYZE_THRESHOLD, refresh sqlite_stat1
+        in the background so the planner keeps choosing the right indexes"""
+        self._writes_since_analyze += count
+        if self._writes_since_analyze >= self.ANALYZE_THRESHOLD:
+            self._writes_since_analyze = 0
+            threading.Thread(target=self._analyze, daemon=True).start()
+    
+    def _analyze(self):
+        """Run ANALYZE on the shared connection"""
         try:
-            if type not in ['income', 'expense']:
+            with self._lock:
+                self.db.conn.execute("ANALYZE")
+        except Exception as e:
+            print(f"Error analyzing database: {e}")
+    
+    def _load_totals(self):
+        """Seed the running totals from the database in one grouped query"""
+        with self._lock:
+            self._income_total = 0
+            self._expense_total = 0
+            self._monthly.clear()
+            for month, income, expense in self._query_monthly_series():
+                self._apply_totals(_TYPE_CODES['income'], month, income)
+                self._apply_totals(_TYPE_CODES['expense'], month, expense)
+    
+    def _query_monthly_series(self) -> List[Tuple[str, int, int]]:
+        """Aggregate (month, income, expense) cents in SQLite, one row per month"""
+        with self._lock:
+            cursor = self.db.conn.cursor()
+            cursor.execute("""
+                SELECT ym,
+                       COALESCE(SUM(CASE WHEN type = 0 THEN amount_cents END), 0),
+                       COALESCE(SUM(CASE WHEN type = 1 THEN amount_cents END), 0)
+                FROM transactions
+                GROUP BY ym
+                ORDER BY ym
+            """)
+            return cursor.fetchall()
+    
+    def _apply_totals(self, type_code: int, month: str, cents: int):
+        """Add cents (negative to reverse) to the running totals for a month"""
+        if type_code == _TYPE_CODES['income']:
+            self._income_total += cents
+        else:
+            self._expense_total += cents
+        self._monthly[month][type_code] += cents
+    
+    def add_transaction(self, amount: float, type: str, remarks: str = "", date: str = None) -> Optional[int]:
+        """Add a new transaction (income or expense).
+        Returns the new transaction id, or None on failure"""
+        try:
+            if type not in _TYPE_CODES:
                 raise ValueError("Type must be 'income' or 'expense'")
+            type_code = _TYPE_CODES[type]
+            cents = _to_cents(amount)
+            if date is not None:
+                date = _checked_date(date)
             
-            if date is None:
-                date = datetime.now().strftime("%Y-%m-%d")
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO transactions (amount, type, remarks, date)
-                    VALUES (?, ?, ?, ?)
-                """, (amount, type, remarks, date))
-                conn.commit()
-                return True
+            with self._lock:
+                cursor = self.db.conn.cursor()
+                if date is None:
+                    # Column default fills in today's date
+                    cursor.execute("""
+                        INSERT INTO transactions (amount_cents, type, remarks)
+                        VALUES (?, ?, ?)
+                        RETURNING id, ym
+                    """, (cents, type_code, remarks))
+                else:
+                    cursor.execute("""
+                        INSERT INTO transactions (amount_cents, type, remarks, date)
+                        VALUES (?, ?, ?, ?)
+                        RETURNING id, ym
+                    """, (cents, type_code, remarks, date))
+                # fetchall() runs the statement to completion so it commits
+                transaction_id, month = cursor.fetchall()[0]
+                self._apply_totals(type_code, month, cents)
+                self._note_writes(1)
+                return transaction_id
         except Exception as e:
             print(f"Error adding transaction: {e}")
-            return False
+            return None
+    
+    def add_transactions_bulk(self, rows: List[Tuple]) -> Optional[int]:
+        """Add many (amount, type, remarks, date) rows in one transaction.
+        Returns the number of rows inserted, or None if the batch failed"""
+        try:
+            for _, type, _, _ in rows:
+                if type not in _TYPE_CODES:
+                    raise ValueError("Type must be 'income' or 'expense'")
+            rows = [
+                (_to_cents(amount), _TYPE_CODES[type], remarks,
+                 _checked_date(date) if date is not None else None)
+                for amount, type, remarks, date in rows
+            ]
+            
+            with self._lock:
+                with self.transaction() as cursor:
+                    # A NULL date gets today's date, same as the column default
+                    cursor.executemany("""
+                        INSERT INTO transactions (amount_cents, type, remarks, date)
+                        VALUES (?, ?, ?, COALESCE(?, date('now', 'localtime')))
+                    """, rows)
+                
+                # Re-seed the totals with one aggregation instead of per-row updates
+                self._load_totals()
+                self._note_writes(len(rows))
+                return len(rows)
+        except Exception as e:
+            print(f"Error adding transactions: {e}")
+            return None
+    
+    def _build_transactions_query(self, start_date: str = None, end_date: str = None,
+                                  type: str = None, limit: int = None,
+                                  offset: int = 0, end_before: str = None,
+                                  where: Tuple[str, list] = None) -> Tuple[str, list]:
+        """Build the filtered transactions SELECT and its parameters.
+        
+        end_before is an exclusive upper bound; where is an extra
+        (condition, params) pair ANDed with the rest. Filters must compare
+        the bare ``date`` column (never wrap it in strftime/substr/date())
+        so idx_txn_date / idx_txn_type_date stay usable.
+        """
+        query = f"SELECT {_TRANSACTION_COLUMNS} FROM transactions"
+        params = []
+        
+        conditions = []
+        if where:
+            conditions.append(where[0])
+            params.extend(where[1])
+        if start_date:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            params.append(end_date)
+        if end_before:
+            conditions.append("date < ?")
+            params.append(end_before)
+        if type:
+            conditions.append("type = ?")
+            params.append(_TYPE_CODES.get(type))
+        
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        # id breaks created_at ties so LIMIT/OFFSET pages never overlap
+        query += " ORDER BY date DESC, created_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend((limit, offset))
+        return query, params
     
     def get_transactions(self, start_date: str = None, end_date: str = None, 
-                        type: str = None) -> List[Transaction]:
-        """Get transactions with optional filters"""
+                        type: str = None, limit: int = None,
+                        offset: int = 0) -> List[Transaction]:
+        """Get transactions with optional filters, or one page of them with limit/offset"""
+        try:
+            query, params = self._build_transactions_query(start_date, end_date, type, limit, offset)
+            return self._fetch_transactions(query, params)
+        except Exception as e:
+            print(f"Error getting transactions: {e}")
+            return []
+    
+    def search_transactions(self, text: str = None, amount: float = None,
+                            start_date: str = None, end_date: str = None,
+                            limit: int = None, offset: int = 0) -> Optional[List[Transaction]]:
+        """Search transactions in SQL.
+        
+        text (case-insensitive substring of type, remarks or date) and amount
+        (exact match) are alternatives: a row matching either is returned.
+        start_date/end_date bound the date inclusively; limit/offset select a page.
+        Returns None if the query failed, so callers can tell it from no matches.
+        """
         try:
-            query = """
-                SELECT id, amount, type, remarks, date, created_at
-                FROM transactions
-            """
             params = []
+            matches = []
+            if text:
+                pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                matches.append("remarks LIKE ? ESCAPE '\\'")
+                params.append(pattern)
+                matches.append("date LIKE ? ESCAPE '\\'")
+                params.append(pattern)
+                # Type is stored as a code, so match its name in Python
+                type_codes = [code for name, code in _TYPE_CODES.items() if text.lower() in name]
+                if type_codes:
+                    matches.append(f"type IN ({','.join('?' * len(type_codes))})")
+                    params.extend(type_codes)
+            if amount is not None and math.isfinite(amount):
+                matches.append("amount_cents = ?")
+                params.append(_to_cents(amount))
+            where = ("(" + " OR ".join(matches) + ")", params) if matches else None
             
-            conditions = []
-            if start_date:
-                conditions.append("date >= ?")
-                params.append(start_date)
-            if end_date:
-                conditions.append("date <= ?")
-                params.append(end_date)
-            if type:
-                conditions.append("type = ?")
-                params.append(type)
-            
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            query += " ORDER BY date DESC, created_at DESC"
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                results = cursor.fetchall()
-                
-                transactions = []
-                for row in results:
-                    transaction = Transaction(
-                        id=row[0], amount=row[1], type=row[2],
-                        remarks=row[3], date=row[4], created_at=row[5]
-                    )
-                    transactions.append(transaction)
-                
-                return transactions
+            query, params = self._build_transactions_query(
+                start_date, end_date, limit=limit, offset=offset, where=where
+            )
+            return self._fetch_transactions(query, params)
+        except Exception as e:
+            print(f"Error searching transactions: {e}")
+            return None
+    
+    def get_transaction(self, transaction_id: int) -> Optional[Transaction]:
+        """Get a single transaction by id"""
+        try:
+            transactions = self._fetch_transactions(
+                f"SELECT {_TRANSACTION_COLUMNS} FROM transactions WHERE id = ?", (transaction_id,)
+            )
+            return transactions[0] if transactions else None
+        except Exception as e:
+            print(f"Error getting transaction: {e}")
+            return None
+    
+    def get_transactions_between(self, start_date: str, end_date: str,
+                                 type: str = None) -> List[Transaction]:
+        """Get transactions with start_date <= date < end_date (half-open range)"""
+        try:
+            query, params = self._build_transactions_query(start_date, type=type, end_before=end_date)
+            return self._fetch_transactions(query, params)
         except Exception as e:
             print(f"Error getting transactions: {e}")
             return []
     
+    def _fetch_transactions(self, query: str, params) -> List[Transaction]:
+        """Run a SELECT of the transaction columns and wrap each row"""
+        with self._lock:
+            cursor = self.db.conn.cursor()
+            cursor.execute(query, params)
+            results = cursor.fetchall()
+        
+        transactions = []
+        for row in results:
+            transaction = Transaction(
+                id=row["id"], amount=row["amount"], type=row["type"],
+                remarks=row["remarks"], date=row["date"], created_at=row["created_at"]
+            )
+            transactions.append(transaction)
+        
+        return transactions
+    
+    def iter_transaction_batches(self, start_date: str = None, end_date: str = None,
+                                 type: str = None, batch_size: int = 1024) -> Iterator[List[sqlite3.Row]]:
+        """Stream filtered rows in lists of at most batch_size, bounding peak memory"""
+        query, params = self._build_transactions_query(start_date, end_date, type)
+        with self._lock:
+            cursor = self.db.conn.cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(query, params)
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany()
+            if not batch:
+                return
+            yield batch
+    
+    def iter_rows(self, batch_size: int = 1024) -> Iterator[sqlite3.Row]:
+        """Stream raw (id, amount, type, remarks, date, created_at) rows, newest first"""
+        for batch in self.iter_transaction_batches(batch_size=batch_size):
+            yield from batch
+    
     def get_balance(self) -> float:
         """Calculate current balance (total income - total expenses)"""
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Get total income
-                cursor.execute("""
-                    SELECT COALESCE(SUM(amount), 0) 
-                    FROM transactions 
-                    WHERE type = 'income'
-                """)
-                total_income = cursor.fetchone()[0]
-                
-                # Get total expenses
-                cursor.execute("""
-                    SELECT COALESCE(SUM(amount), 0) 
-                    FROM transactions 
-                    WHERE type = 'expense'
-                """)
-                total_expenses = cursor.fetchone()[0]
-                
-                return total_income - total_expenses
-        except Exception as e:
-            print(f"Error calculating balance: {e}")
-            return 0.0
+        with self._lock:
+            return (self._income_total - self._expense_total) / 100
     
     def get_income_total(self) -> float:
         """Get total income"""
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE type = 'income'")
-                return cursor.fetchone()[0]
-        except Exception as e:
-            print(f"Error getting income total: {e}")
-            return 0.0
+        with self._lock:
+            return self._income_total / 100
     
     def get_expense_total(self) -> float:
         """Get total expenses"""
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE type = 'expense'")
-                return cursor.fetchone()[0]
-        except Exception as e:
-            print(f"Error getting expense total: {e}")
-            return 0.0
+        with self._lock:
+            return self._expense_total / 100
+    
+    def get_totals(self) -> Tuple[float, float, float]:
+        """Get (income, expense, balance) from the running totals in one call"""
+        with self._lock:
+            return (
+                self._income_total / 100,
+                self._expense_total / 100,
+                (self._income_total - self._expense_total) / 100,
+            )
     
     def get_monthly_summary(self, year: int = None, month: int = None) -> Dict:
         """Get monthly summary of income and expenses"""
-        try:
-            if year is None:
-                year = datetime.now().year
-            if month is None:
-                month = datetime.now().month
-            
-            start_date = f"{year:04d}-{month:02d}-01"
-            if month == 12:
-                end_date = f"{year+1:04d}-01-01"
-            else:
-                end_date = f"{year:04d}-{month+1:02d}-01"
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Monthly income
-                cursor.execute("""
-                    SELECT COALESCE(SUM(amount), 0)
-                    FROM transactions
-                    WHERE type = 'income' AND date >= ? AND date < ?
-                """, (start_date, end_date))
-                monthly_income = cursor.fetchone()[0]
-                
-                # Monthly expenses
-                cursor.execute("""
-                    SELECT COALESCE(SUM(amount), 0)
-                    FROM transactions
-                    WHERE type = 'expense' AND date >= ? AND date < ?
-                """, (start_date, end_date))
-                monthly_expenses = cursor.fetchone()[0]
-                
-                return {
-                    'monthly_income': monthly_income,
-                    'monthly_expenses': monthly_expenses,
-                    'monthly_balance': monthly_income - monthly_expenses,
-                    'month': month,
-                    'year': year
-                }
-        except Exception as e:
-            print(f"Error getting monthly summary: {e}")
-            return {}
+        if year is None:
+            year = datetime.now().year
+        if month is None:
+            month = datetime.now().month
+        
+        with self._lock:
+            income_cents, expense_cents = self._monthly.get(f"{year:04d}-{month:02d}", (0, 0))
+        
+        return {
+            'monthly_income': income_cents / 100,
+            'monthly_expenses': expense_cents / 100,
+            'monthly_balance': (income_cents - expense_cents) / 100,
+            'month': month,
+            'year': year
+        }
+    
+    def get_monthly_series(self) -> List[Tuple[str, float, float]]:
+        """Get (month, income, expense) per month, oldest first"""
+        with self._lock:
+            return [
+                (month, income / 100, expense / 100)
+                for month, (income, expense) in sorted(self._monthly.items())
+                if income or expense
+            ]
     
     def delete_transaction(self, transaction_id: int) -> bool:
         """Delete a transaction"""
         try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
-                conn.commit()
-                return cursor.rowcount > 0
+            with self._lock:
+                with self.transaction() as cursor:
+                    cursor.execute("SELECT type, ym, amount_cents FROM transactions WHERE id = ?", (transaction_id,))
+                    old = cursor.fetchone()
+                    cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
+                    # Read before COMMIT runs on this cursor and resets it
+                    deleted = cursor.rowcount
+                if old is None or deleted == 0:
+                    return False
+                self._apply_totals(old[0], old[1], -old[2])
+                self._note_writes(1)
+                return True
         except Exception as e:
             print(f"Error deleting transaction: {e}")
             return False
     
+    def delete_transactions(self, transaction_ids: List[int]) -> int:
+        """Delete several transactions in one transaction.
+        Returns the number of rows deleted (0 if the batch failed)"""
+        try:
+            ids = list(transaction_ids)
+            if not ids:
+                return 0
+            
+            with self._lock:
+                deleted = []
+                with self.transaction() as cursor:
+                    # Stay well below SQLite's bound-parameter limit
+                    for i in range(0, len(ids), 500):
+                        chunk = ids[i:i + 500]
+                        placeholders = ",".join("?" * len(chunk))
+                        cursor.execute(f"SELECT type, ym, amount_cents FROM transactions WHERE id IN ({placeholders})", chunk)
+                        deleted.extend(cursor.fetchall())
+                        cursor.execute(f"DELETE FROM transactions WHERE id IN ({placeholders})", chunk)
+                
+                for type_code, month, cents in deleted:
+                    self._apply_totals(type_code, month, -cents)
+                self._note_writes(len(deleted))
+                return len(deleted)
+        except Exception as e:
+            print(f"Error deleting transactions: {e}")
+            return 0
+    
     def update_transaction(self, transaction_id: int, amount: float = None, type: str = None, remarks: str = None, date: str = None) -> bool:
         """Update a transaction"""
         try:
-            updates = []
-            params = []
-            
-            if amount is not None:
-                updates.append("amount = ?")
-                params.append(amount)
-            if type is not None:
-                if type not in ['income', 'expense']:
-                    raise ValueError("Type must be 'income' or 'expense'")
-                updates.append("type = ?")
-                params.append(type)
-            if remarks is not None:
-                updates.append("remarks = ?")
-                params.append(remarks)
-            if date is not None:
-                updates.append("date = ?")
-                params.append(date)
-            
-            if not updates:
+            if amount is None and type is None and remarks is None and date is None:
                 return False
+            if type is not None and type not in _TYPE_CODES:
+                raise ValueError("Type must be 'income' or 'expense'")
+            type_code = _TYPE_CODES.get(type)
+            cents = _to_cents(amount) if amount is not None else None
+            if date is not None:
+                date = _checked_date(date)
             
-            params.append(transaction_id)
-            
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"""
-                    UPDATE transactions 
-                    SET {', '.join(updates)} 
-                    WHERE id = ?
-                """, params)
-                conn.commit()
-                return cursor.rowcount > 0
+            with self._lock:
+                with self.transaction() as cursor:
+                    cursor.execute("SELECT type, ym, amount_cents FROM transactions WHERE id = ?", (transaction_id,))
+                    old = cursor.fetchone()
+                    if old is None:
+                        return False
+                    
+                    # Fixed SQL text (NULL keeps the column) so the prepared
+                    # statement is reused regardless of which fields changed
+                    cursor.execute("""
+                        UPDATE transactions 
+                        SET amount_cents = COALESCE(?, amount_cents),
+                            type = COALESCE(?, type),
+                            remarks = COALESCE(?, remarks),
+                            date = COALESCE(?, date)
+                        WHERE id = ?
+                    """, (cents, type_code, remarks, date, transaction_id))
+                    # Read before COMMIT runs on this cursor and resets it
+                    updated = cursor.rowcount
+                if updated == 0:
+                    return False
+                
+                old_type, old_month, old_cents = old
+                self._apply_totals(old_type, old_month, -old_cents)
+                self._apply_totals(
+                    type_code if type_code is not None else old_type,
+                    date[:7] if date is not None else old_month,
+                    cents if cents is not None else old_cents,
+                )
+                return True
         except Exception as e:
             print(f"Error updating transaction: {e}")
             return False
@@ -2,11 +2,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from collections import defaultdict
 import csv
 
-from backend import FinanceManager
+from backend import FinanceManager, normalize_date
 
 
 class FinanceApp:
@@ -19,9 +19,59 @@ class FinanceApp:
         # Backend finance manager instance
         self.fm = FinanceManager()
 
+        # Single DB worker: queries run off the Tk thread, one at a time,
+        # and results come back through root.after
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._table_generation = 0
+        self._closing = False
+
+        # Graph window, figure and bar artists, built once and reused
+        self._graph_win = None
+        self._graph_ax = None
+        self._graph_canvas = None
+        self._graph_bars = None
+        self._graph_months = None
+
         self.create_widgets()
         self.populate_table()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        # Closing on the worker lets a running task (e.g. a CSV export)
+        # finish on the open connection first. Blocking here instead would
+        # deadlock: the worker's root.after calls need the Tk thread.
+        self._closing = True
+        self._table_generation += 1  # stops any table streaming
+        self._pool.submit(self.fm.close)
+        self._pool.shutdown(wait=False)
+        self.root.destroy()
+
+    def _post(self, func, *args):
+        """Schedule func on the Tk thread unless the window is gone"""
+        if self._closing:
+            return
+        try:
+            self.root.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # root destroyed between the check and the call
+
+    def _run_in_background(self, func, on_done, on_error=None):
+        """Run func on the DB worker and pass its result to on_done on the Tk thread"""
+        future = self._pool.submit(func)
+        future.add_done_callback(lambda f: self._post(self._deliver, f, on_done, on_error))
+
+    def _deliver(self, future, on_done, on_error):
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            else:
+                messagebox.showerror("Error", str(e))
+            return
+        on_done(result)
+
     def create_widgets(self):
         columns = ("id", "amount", "type", "remarks", "date", "created_at")
         self.table = ttk.Treeview(self.root, columns=columns, show="headings", height=18)
@@ -39,12 +89,31 @@ class FinanceApp:
         tk.Button(btn_frame, text="Show Graph", command=self.show_graph).pack(side="left", padx=5)
 
     def populate_table(self):
-        for row in self.table.get_children():
-            self.table.delete(row)
+        # A newer refresh makes chunks still queued from an older one stale
+        self._table_generation += 1
 
-        transactions = self.fm.get_transactions()
-        for t in transactions:
-            self.table.insert("", "end", values=(t.id, t.amount, t.type, t.remarks, t.date, t.created_at))
+        # One Tcl call clears the table instead of one per row
+        self.table.delete(*self.table.get_children())
+        self._pool.submit(self._stream_rows, self._table_generation)
+
+    def _stream_rows(self, generation):
+        # Worker thread: hand each fetched chunk to Tk as it arrives, so large
+        # tables never sit fully in memory and the UI stays responsive
+        try:
+            for batch in self.fm.iter_transaction_batches():
+                if generation != self._table_generation:
+                    return
+                self._post(self._append_rows, generation, batch)
+        except Exception as e:
+            print(f"Error loading transactions: {e}")
+
+    def _append_rows(self, generation, batch):
+        if generation != self._table_generation:
+            return
+        # Rows are already in column order
+        insert = self.table.insert
+        for row in batch:
+            insert("", "end", values=tuple(row))
 
     def export_csv(self):
         file_path = filedialog.asksaveasfilename(
@@ -55,36 +124,34 @@ class FinanceApp:
         if not file_path:
             return
 
-        transactions = self.fm.get_transactions()
-        try:
+        def write_csv():
             with open(file_path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(["id", "amount", "type", "remarks", "date", "created_at"])
-                for t in transactions:
-                    writer.writerow([t.id, t.amount, t.type, t.remarks, t.date, t.created_at])
+                writer.writerows(self.fm.iter_rows())
 
-            messagebox.showinfo("Success", f"CSV exported successfully:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export CSV:\n{e}")
+        self._run_in_background(
+            write_csv,
+            lambda _: messagebox.showinfo("Success", f"CSV exported successfully:\n{file_path}"),
+            lambda e: messagebox.showerror("Error", f"Failed to export CSV:\n{e}"),
+        )
 
     def show_graph(self):
-        transactions = self.fm.get_transactions()
+        # Per-month totals are aggregated by the backend, already sorted
+        self._run_in_background(self.fm.get_monthly_series, self._show_graph)
 
-        monthly_income = defaultdict(float)
-        monthly_expense = defaultdict(float)
-
-        for t in transactions:
-            dt = datetime.fromisoformat(t.created_at)
-            key = dt.strftime("%Y-%m")
+    def _show_graph(self, series):
+        if not series:
+            messagebox.showinfo("Info", "No data available for graph.")
+            return
 
-            if t.type == "income":
-                monthly_income[key] += t.amount
-            elif t.type == "expense":
-                monthly_expense[key] += t.amount
+        months, income_values, expense_values = (list(col) for col in zip(*series))
 
-        months = sorted(set(list(monthly_income.keys()) + list(monthly_expense.keys())))
-        income_values = [monthly_income[m] for m in months]
-        expense_values = [monthly_expense[m] for m in months]
+        # Window still open: push the new numbers through the existing artists
+        if self._graph_win is not None and self._graph_win.winfo_exists():
+            self._draw_bars(months, income_values, expense_values)
+            self._graph_win.lift()
+            return
 
         graph_win = tk.Toplevel(self.root)
         graph_win.title("Monthly Income vs Expense")
@@ -92,21 +159,42 @@ class FinanceApp:
         graph_win.resizable(True, True)
 
         fig = Figure(figsize=(10, 5))
-        ax = fig.add_subplot(111)
-
-        ax.bar(months, expense_values, label="Expense", color="#E53935")
-        ax.bar(months, income_values, bottom=expense_values, label="Income", color="#4CAF50")
-
-        ax.set_xlabel("Month")
-        ax.set_ylabel("Amount")
-        ax.set_title("Monthly Income vs Expense (Stacked Bar Chart)")
-        ax.legend()
-
-        fig.autofmt_xdate()
-
-        canvas = FigureCanvasTkAgg(fig, master=graph_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._graph_ax = fig.add_subplot(111)
+        self._graph_canvas = FigureCanvasTkAgg(fig, master=graph_win)
+        self._graph_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self._graph_win = graph_win
+        self._graph_months = None
+
+        self._draw_bars(months, income_values, expense_values)
+
+    def _draw_bars(self, months, income_values, expense_values):
+        ax = self._graph_ax
+
+        if months == self._graph_months:
+            # Same months: only bar heights (and income offsets) change
+            expense_bars, income_bars = self._graph_bars
+            for rect, exp in zip(expense_bars, expense_values):
+                rect.set_height(exp)
+            for rect, inc, exp in zip(income_bars, income_values, expense_values):
+                rect.set_y(exp)
+                rect.set_height(inc)
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            ax.clear()
+            expense_bars = ax.bar(months, expense_values, label="Expense", color="#E53935")
+            income_bars = ax.bar(months, income_values, bottom=expense_values, label="Income", color="#4CAF50")
+            self._graph_bars = (expense_bars, income_bars)
+            self._graph_months = months
+
+            ax.set_xlabel("Month")
+            ax.set_ylabel("Amount")
+            ax.set_title("Monthly Income vs Expense (Stacked Bar Chart)")
+            ax.legend()
+
+            ax.figure.autofmt_xdate()
+
+        self._graph_canvas.draw_idle()
 
     def open_add_window(self):
         add_win = tk.Toplevel(self.root)
@@ -141,12 +229,9 @@ class FinanceApp:
 
             txn_type = type_var.get()
             remarks = remarks_entry.get()
-            date_str = date_entry.get()
-
-            # Validate date format
-            try:
-                datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
+            # Validate the date and store it zero-padded (2024-1-5 -> 2024-01-05)
+            date_str = normalize_date(date_entry.get())
+            if date_str is None:
                 messagebox.showerror("Error", "Date must be in YYYY-MM-DD format")
                 return
 
@@ -170,12 +255,10 @@ class FinanceApp:
         if not confirm:
             return
 
-        for sel in selected:
-            values = self.table.item(sel)["values"]
-            transaction_id = values[0]
-            success = self.fm.delete_transaction(transaction_id)
-            if not success:
-                messagebox.showerror("Error", f"Failed to delete transaction with ID {transaction_id}")
+        transaction_ids = [self.table.item(sel)["values"][0] for sel in selected]
+        deleted = self.fm.delete_transactions(transaction_ids)
+        if deleted < len(transaction_ids):
+            messagebox.showerror("Error", f"Failed to delete {len(transaction_ids) - deleted} of {len(transaction_ids)} transactions")
         self.populate_table()
 
 
@@ -2,15 +2,19 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 import csv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import openpyxl
+import importlib.util
+import math
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 
 
-from backend import FinanceManager, Transaction
+from backend import FinanceManager, Transaction, normalize_date
 
 
 class FinanceApp:
+    # Rows fetched per table page; further pages load as the user scrolls
+    PAGE_SIZE = 500
+
     def __init__(self, root):
         self.root = root
         self.root.title("Personal Finance Manager")
@@ -19,12 +23,57 @@ class FinanceApp:
         self.fm = FinanceManager()
         self.selected_transaction: Transaction | None = None
 
+        # Transactions shown in the table, keyed by id (the Treeview iid)
+        self._tx_by_id: dict[int, Transaction] = {}
+
+        # loader(offset, limit) for the rows currently listed; None once the
+        # last page is shown
+        self._page_loader = None
+        self._loaded_count = 0
+        self._page_load_pending = False
+
+        # Last text search as (query, [(tr, "remarks\0type\0date" lowercased), ...]);
+        # a longer query that extends it is narrowed in memory
+        self._search_index = None
+
+        # Balance graph window, kept so reopening only swaps the line data
+        self._graph_win = None
+        self._graph_ax = None
+        self._graph_canvas = None
+        self._graph_line = None
+
+        # File parsing for imports runs here so the UI stays responsive
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._closing = False
+
         self.create_widgets()
         self.populate_table()
         self.update_summary_labels()
 
         self.search_after_id = None
 
+        # UI refreshes requested during one event batch run once, when idle
+        self._refresh_pending = False
+        self._refresh_table = False
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        # Parsing threads never touch the database; results still in flight
+        # are dropped by _post once the window is going away
+        self._closing = True
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.fm.close()
+        self.root.destroy()
+
+    def _post(self, func, *args):
+        """Schedule func on the Tk thread unless the window is gone"""
+        if self._closing:
+            return
+        try:
+            self.root.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # root destroyed between the check and the call
 
     def create_widgets(self):
         # --- Top Frame: Add Transaction Form ---
@@ -117,48 +166,125 @@ class FinanceApp:
 
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
-        self.table.configure(yscroll=scrollbar.set)
+        self.scrollbar = scrollbar
+        self.table.configure(yscroll=self._on_table_scroll)
 
         # PACK ORDER
         self.table.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
     def populate_table(self):
-        for row in self.table.get_children():
-            self.table.delete(row)
+        self._start_paging(
+            lambda offset, limit: self.fm.get_transactions(limit=limit, offset=offset)
+        )
+
+    def _start_paging(self, loader):
+        """Show the first page from loader(offset, limit) and return it (None on failure)"""
+        page = loader(0, self.PAGE_SIZE)
+        if page is None:
+            messagebox.showerror("Error", "Failed to load transactions")
+            return None
+        self._fill_table(page)
+        self._loaded_count = len(page)
+        # A short page means there is nothing left to load
+        self._page_loader = loader if len(page) == self.PAGE_SIZE else None
+        return page
+
+    def _on_table_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Near the bottom: fetch the next page once Tk is idle
+        if float(last) > 0.9 and self._page_loader is not None and not self._page_load_pending:
+            self._page_load_pending = True
+            self.root.after_idle(self._load_next_page)
+
+    def _load_next_page(self):
+        self._page_load_pending = False
+        loader = self._page_loader
+        if loader is None:
+            return
 
-        for tr in self.fm.get_transactions():
-            self.table.insert("", tk.END, values=(tr.id, tr.amount, tr.type, tr.remarks, tr.date, tr.created_at))
+        page = loader(self._loaded_count, self.PAGE_SIZE)
+        if page is None:
+            self._page_loader = None
+            return
+        self._loaded_count += len(page)
+        if len(page) < self.PAGE_SIZE:
+            self._page_loader = None
+
+        insert = self.table.insert
+        for tr in page:
+            # Rows added since the first page may already be listed
+            if tr.id in self._tx_by_id:
+                continue
+            self._tx_by_id[tr.id] = tr
+            insert("", tk.END, iid=str(tr.id), values=self._row_values(tr))
+
+    def _fill_table(self, transactions):
+        self._search_index = None
+
+        # One Tcl call clears the table instead of one per row
+        self.table.delete(*self.table.get_children())
+
+        self._tx_by_id = {tr.id: tr for tr in transactions}
+        rows = [(str(tr.id), self._row_values(tr)) for tr in self._tx_by_id.values()]
+        insert = self.table.insert
+        for iid, values in rows:
+            insert("", tk.END, iid=iid, values=values)
+
+    @staticmethod
+    def _row_values(tr):
+        return (tr.id, tr.amount, tr.type, tr.remarks, tr.date, tr.created_at)
+
+    def _insert_row(self, tr, index=tk.END):
+        # The transaction id doubles as the Treeview item id, so single rows
+        # can be updated or removed without rebuilding the table
+        self._tx_by_id[tr.id] = tr
+        self.table.insert("", index, iid=str(tr.id), values=self._row_values(tr))
 
     def select_transaction(self, event):
         selected = self.table.selection()
         if not selected:
             return
-        values = self.table.item(selected[0])["values"]
-        self.selected_transaction = Transaction(*values)
+        # Use the cached object rather than Tk's stringified cell values
+        tr = self._tx_by_id.get(int(selected[0]))
+        if tr is None:
+            return
+        self.selected_transaction = tr
 
         # Populate form fields
         self.amount_entry.delete(0, tk.END)
-        self.amount_entry.insert(0, values[1])
+        self.amount_entry.insert(0, tr.amount)
 
-        self.type_var.set(values[2])
+        self.type_var.set(tr.type)
 
         self.remarks_entry.delete(0, tk.END)
-        self.remarks_entry.insert(0, values[3])
+        self.remarks_entry.insert(0, tr.remarks)
 
         self.date_entry.delete(0, tk.END)
-        self.date_entry.insert(0, values[4])
+        self.date_entry.insert(0, tr.date)
 
     def add_transaction(self):
         try:
             amount = float(self.amount_entry.get())
             type_ = self.type_var.get()
             remarks = self.remarks_entry.get()
-            date = self.date_entry.get()
+            date = normalize_date(self.date_entry.get())
+            if date is None:
+                messagebox.showerror("Error", "Invalid date format! Use YYYY-MM-DD")
+                return
 
-            self.fm.add_transaction(amount, type_, remarks, date)
-            self.populate_table()
-            self.update_summary_labels()
+            transaction_id = self.fm.add_transaction(amount, type_, remarks, date)
+            if transaction_id is None:
+                messagebox.showerror("Error", "Failed to add transaction")
+                return
+
+            self._search_index = None
+
+            # Show the new row at the top rather than reloading every row
+            tr = self.fm.get_transaction(transaction_id)
+            if tr is not None:
+                self._insert_row(tr, 0)
+            self._request_refresh()
             self.clear_form()
         except ValueError:
             messagebox.showerror("Error", "Invalid amount")
@@ -168,16 +294,28 @@ class FinanceApp:
             messagebox.showwarning("Warning", "No transaction selected")
             return
 
+        date = normalize_date(self.date_entry.get())
+        if date is None:
+            messagebox.showerror("Error", "Invalid date format! Use YYYY-MM-DD")
+            return
+
         try:
-            self.fm.update_transaction(
-                self.selected_transaction.id,
+            transaction_id = self.selected_transaction.id
+            updated = self.fm.update_transaction(
+                transaction_id,
                 amount=float(self.amount_entry.get()),
                 type=self.type_var.get(),
                 remarks=self.remarks_entry.get(),
-                date=self.date_entry.get(),
+                date=date,
             )
-            self.populate_table()
-            self.update_summary_labels()
+            self._search_index = None
+            iid = str(transaction_id)
+            if updated and self.table.exists(iid):
+                tr = self.fm.get_transaction(transaction_id)
+                if tr is not None:
+                    self._tx_by_id[tr.id] = tr
+                    self.table.item(iid, values=self._row_values(tr))
+            self._request_refresh()
         except ValueError:
             messagebox.showerror("Error", "Invalid amount")
 
@@ -187,30 +325,57 @@ class FinanceApp:
             return
 
         if messagebox.askyesno("Confirm", "Delete selected transaction?"):
-            self.fm.delete_transaction(self.selected_transaction.id)
-            self.populate_table()
-            self.update_summary_labels()
+            self._search_index = None
+            iid = str(self.selected_transaction.id)
+            if self.fm.delete_transaction(self.selected_transaction.id) and self.table.exists(iid):
+                self._tx_by_id.pop(self.selected_transaction.id, None)
+                self.table.delete(iid)
+                # Later pages shift up by the removed row
+                self._loaded_count = max(self._loaded_count - 1, 0)
+            self._request_refresh()
             self.clear_form()
 
+    def _request_refresh(self, table=False):
+        """Schedule one idle-time refresh of the summary (and optionally the table)"""
+        self._refresh_table = self._refresh_table or table
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        table = self._refresh_table
+        self._refresh_pending = False
+        self._refresh_table = False
+        if table:
+            self.populate_table()
+        self.update_summary_labels()
+
     def update_summary_labels(self):
-        self.balance_label.config(text=f"Balance: {self.fm.get_balance():.2f}")
-        self.income_label.config(text=f"Total Income: {self.fm.get_income_total():.2f}")
-        self.expense_label.config(text=f"Total Expense: {self.fm.get_expense_total():.2f}")
+        income, expense, balance = self.fm.get_totals()
+        self.balance_label.config(text=f"Balance: {balance:.2f}")
+        self.income_label.config(text=f"Total Income: {income:.2f}")
+        self.expense_label.config(text=f"Total Expense: {expense:.2f}")
 
     def clear_form(self):
+        # Only a filtered (searched) table needs reloading to show every row
+        was_searching = bool(self.search_entry.get().strip())
+
         self.amount_entry.delete(0, tk.END)
         self.remarks_entry.delete(0, tk.END)
         self.search_entry.delete(0, tk.END)
         self.date_entry.delete(0, tk.END)
         self.date_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
         self.type_var.set("income")
-        self.populate_table()
+        if was_searching:
+            self._request_refresh(table=True)
         self.selected_transaction = None
 
     # ========================= CSV EXPORT =========================
     def export_csv(self):
-        transactions = self.fm.get_transactions()
-        if not transactions:
+        # Rows stream from the database; only the first is read up front
+        rows = self.fm.iter_rows()
+        first = next(rows, None)
+        if first is None:
             messagebox.showinfo("Info", "No transactions to export.")
             return
 
@@ -220,13 +385,13 @@ class FinanceApp:
             initialfile=f"transactions_{datetime.now().strftime('%Y-%m-%d')}.csv"
         )
         if not file_path:
+            rows.close()
             return  # Cancelled
 
-        with open(file_path, mode="w", newline="", encoding="utf-8") as file:
+        with open(file_path, mode="w", newline="", encoding="utf-8", buffering=1 << 20) as file:
             writer = csv.writer(file)
             writer.writerow(["id", "amount", "type", "remarks", "date", "created_at"])
-            for tr in transactions:
-                writer.writerow([tr.id, tr.amount, tr.type, tr.remarks, tr.date, tr.created_at])
+            writer.writerows(chain((first,), rows))
 
         messagebox.showinfo("Success", f"CSV exported successfully!\n{file_path}")
 
@@ -266,6 +431,18 @@ class FinanceApp:
 
 
     def show_graph(self):
+        # matplotlib/numpy load on first use rather than at startup
+        try:
+            import numpy as np
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+        except ImportError as e:
+            messagebox.showerror(
+                "Error", f"Graphs need matplotlib and numpy ({e.name or 'a module'} is missing).\n"
+                         "Install them with: pip install matplotlib numpy"
+            )
+            return
+
         from_date = self.graph_from_entry.get().strip()
         to_date = self.graph_to_entry.get().strip()
 
@@ -273,7 +450,7 @@ class FinanceApp:
         try:
             datetime.strptime(from_date, "%Y-%m-%d")
             datetime.strptime(to_date, "%Y-%m-%d")
-        except:
+        except ValueError:
             messagebox.showerror("Error", "Invalid date format! Use YYYY-MM-DD")
             return
 
@@ -284,25 +461,67 @@ class FinanceApp:
             messagebox.showinfo("Info", "No transactions in selected date range.")
             return
 
-        transactions.sort(key=lambda t: t.date)
-
-        dates = [t.date for t in transactions]
-        balance_values = []
+        # Real dates give a time axis instead of one category per string
+        count = len(transactions)
+        raw_dates = [t.date for t in transactions]
+        try:
+            dates = np.array(raw_dates, dtype="datetime64[D]")
+        except ValueError:
+            # Rows saved before dates were normalised may not be ISO; parse
+            # them one by one and let the unparseable ones become NaT
+            dates = np.array([normalize_date(d) or "NaT" for d in raw_dates], dtype="datetime64[D]")
+        amounts = np.fromiter((t.amount for t in transactions), dtype=np.float64, count=count)
+        types = np.array([t.type for t in transactions])
+
+        valid = ~np.isnat(dates)
+        skipped = count - int(valid.sum())
+        if skipped:
+            dates, amounts, types = dates[valid], amounts[valid], types[valid]
+            count -= skipped
+            if not count:
+                messagebox.showinfo("Info", "No transactions with a valid date in selected range.")
+                return
+            messagebox.showwarning("Warning", f"{skipped} transaction(s) with an invalid date were left out of the graph.")
 
         # Calculate running balance within the range
-        balance = 0
-        for tr in transactions:
-            balance += tr.amount if tr.type == "income" else -tr.amount
-            balance_values.append(balance)
+        signed = amounts * np.where(types == "income", 1.0, -1.0)
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        balance_values = np.cumsum(signed[order])
+
+        # Thin long ranges to ~2000 points, keeping the closing balance
+        step = count // 2000
+        if step > 1:
+            keep = np.arange(0, count, step)
+            if keep[-1] != count - 1:
+                keep = np.append(keep, count - 1)
+            dates, balance_values = dates[keep], balance_values[keep]
+
+        title = f"Balance Over Time ({from_date} to {to_date})"
+
+        # Window already built (possibly hidden): swap the line data instead
+        # of rebuilding the figure
+        if self._graph_win is not None and self._graph_win.winfo_exists():
+            self._graph_line.set_data(dates, balance_values)
+            self._graph_ax.set_title(title)
+            self._graph_ax.relim()
+            self._graph_ax.autoscale_view()
+            self._graph_canvas.draw_idle()
+            self._graph_win.deiconify()
+            self._graph_win.lift()
+            return
 
         # ---- Graph Window ----
         graph_window = tk.Toplevel(self.root)
         graph_window.title("Balance Over Time")
         graph_window.geometry("800x500")
+        # Closing only hides the window so the next graph can reuse it
+        graph_window.protocol("WM_DELETE_WINDOW", graph_window.withdraw)
 
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.plot(dates, balance_values, marker="o")
-        ax.set_title(f"Balance Over Time ({from_date} to {to_date})")
+        fig = Figure(figsize=(8, 4))
+        ax = fig.add_subplot(111)
+        (self._graph_line,) = ax.plot(dates, balance_values, marker="o")
+        ax.set_title(title)
         ax.set_xlabel("Date")
         ax.set_ylabel("Balance")
         ax.grid(True)
@@ -312,6 +531,10 @@ class FinanceApp:
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        self._graph_win = graph_window
+        self._graph_ax = ax
+        self._graph_canvas = canvas
+
 
     # ========================= Bulk Upload =========================
     def bulk_upload_excel(self):
@@ -323,54 +546,78 @@ class FinanceApp:
         if not file_path:
             return  # User cancelled
 
-        count = 0
+        # openpyxl is only needed (and only loaded) for Excel files
+        if not file_path.lower().endswith(".csv") and importlib.util.find_spec("openpyxl") is None:
+            messagebox.showerror("Error", "Excel import needs openpyxl.\nInstall it with: pip install openpyxl")
+            return
+
+        # Parse on a worker thread; the DB insert and UI refresh happen back
+        # on the Tk thread once parsing is done
+        future = self._io_pool.submit(self._parse_file, file_path)
+        future.add_done_callback(lambda f: self._post(self._apply_bulk, f))
 
+    def _parse_file(self, file_path):
+        """Parse a CSV/XLSX file into (amount, type, remarks, date) rows"""
+        # pandas (optional) parses and cleans whole columns in C
         try:
-            # ---------------------------------------------------
-            # CASE 1: CSV FILE
-            # ---------------------------------------------------
-            if file_path.lower().endswith(".csv"):
-                import csv
-                with open(file_path, newline="", encoding="utf-8") as f:
-                    reader = csv.reader(f)
-                    next(reader, None)  # skip header
-
-                    for row in reader:
-                        if len(row) < 4:
-                            continue  # not enough columns
-
-                        amount, type_, remarks, date = row
-
-                        # Validate amount
-                        try:
-                            amount = float(amount)
-                        except:
-                            continue
-
-                        type_ = type_.strip().lower()
-                        remarks = remarks.strip()
-
-                        # Fix date formatting
-                        date = str(date).replace("/", "-")
-
-                        self.fm.add_transaction(amount, type_, remarks, date)
-                        count += 1
-
-            # ---------------------------------------------------
-            # CASE 2: EXCEL FILE
-            # ---------------------------------------------------
-            else:
-                wb = openpyxl.load_workbook(file_path)
-                sheet = wb.active
+            import pandas as pd
+        except ImportError:
+            pd = None
+        if pd is not None:
+            return self._parse_file_pandas(pd, file_path)
+
+        rows = []
+
+        # ---------------------------------------------------
+        # CASE 1: CSV FILE
+        # ---------------------------------------------------
+        if file_path.lower().endswith(".csv"):
+            with open(file_path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)  # skip header
 
-                for i, row in enumerate(sheet.iter_rows(values_only=True)):
-                    if i == 0:
-                        continue  # skip header
+                for row in reader:
+                    if len(row) < 4:
+                        continue  # not enough columns
+
+                    amount, type_, remarks, date = row[:4]  # extra columns are ignored
+
+                    # Validate amount
+                    try:
+                        amount = float(amount)
+                    except ValueError:
+                        continue
+                    if not math.isfinite(amount):
+                        continue  # "nan"/"inf" parse but cannot be stored
 
+                    type_ = type_.strip().lower()
+                    remarks = remarks.strip()
+
+                    # Store dates as zero-padded YYYY-MM-DD; skip unparseable ones
+                    date = normalize_date(date)
+                    if date is None:
+                        continue
+
+                    rows.append((amount, type_, remarks, date))
+
+        # ---------------------------------------------------
+        # CASE 2: EXCEL FILE
+        # ---------------------------------------------------
+        else:
+            import openpyxl
+
+            # read_only streams rows instead of building every cell object;
+            # data_only returns cached formula results rather than formulas
+            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                sheet = wb.active
+
+                # min_row=2 skips the header
+                for row in sheet.iter_rows(min_row=2, values_only=True):
                     if row is None or len(row) < 4:
                         continue
 
-                    amount, type_, remarks, date = row
+                    amount, type_, remarks, date = row[:4]
 
                     if amount is None or type_ is None or date is None:
                         continue
@@ -378,86 +625,156 @@ class FinanceApp:
                     # Amount must be numeric
                     try:
                         amount = float(amount)
-                    except:
+                    except (TypeError, ValueError):
+                        continue
+                    if not math.isfinite(amount):
                         continue
 
                     type_ = str(type_).strip().lower()
                     remarks = remarks if remarks else ""
 
-                    # Convert date to string
-                    if isinstance(date, datetime):
-                        date = date.strftime("%Y-%m-%d")
-                    else:
-                        date = str(date).replace("/", "-")
+                    # Convert date to a YYYY-MM-DD string; skip unparseable ones
+                    date = normalize_date(date)
+                    if date is None:
+                        continue
 
-                    self.fm.add_transaction(amount, type_, remarks, date)
-                    count += 1
+                    rows.append((amount, type_, remarks, date))
+            finally:
+                # Read-only workbooks keep the file handle open until closed
+                wb.close()
 
-            # ---------------------------------------------------
-            # AFTER IMPORT
-            # ---------------------------------------------------
-            self.populate_table()
-            self.update_summary_labels()
-            messagebox.showinfo("Success", f"{count} transactions imported successfully!")
+        # Rows with an unknown type would fail the whole batch
+        return [row for row in rows if row[1] in ("income", "expense")]
 
+    @staticmethod
+    def _parse_file_pandas(pd, file_path):
+        """Vectorised version of _parse_file used when pandas is installed"""
+        if file_path.lower().endswith(".csv"):
+            df = pd.read_csv(file_path, dtype=str, keep_default_na=False, encoding="utf-8")
+        else:
+            # Read the active sheet, like the openpyxl path, not just the first
+            import openpyxl
+            wb = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                sheet_name = wb.active.title
+            finally:
+                wb.close()
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+
+        if df.shape[1] < 4:
+            return []
+        df = df.iloc[:, :4]
+        df.columns = ["amount", "type", "remarks", "date"]
+        df = df.dropna(subset=["amount", "type", "date"])
+
+        amount = pd.to_numeric(df["amount"].astype(str).str.strip(), errors="coerce").astype(float)
+        type_ = df["type"].astype(str).str.strip().str.lower()
+        remarks = df["remarks"].fillna("").astype(str).str.strip()
+        # Per element: Excel columns can mix date cells and strings
+        date = df["date"].map(normalize_date)
+
+        # Same filters as the row-by-row path: finite amount, known type, valid date
+        keep = (
+            amount.notna() & (amount.abs() != math.inf)
+            & type_.isin(["income", "expense"]) & date.notna()
+        )
+        return list(zip(
+            amount[keep].tolist(),
+            type_[keep].tolist(),
+            remarks[keep].tolist(),
+            date[keep].tolist(),
+        ))
+
+    def _apply_bulk(self, future):
+        try:
+            rows = future.result()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to import file:\n{e}")
+            return
+
+        count = self.fm.add_transactions_bulk(rows)
+        if count is None:
+            messagebox.showerror("Error", "Failed to import file:\nno transactions were saved.")
+            return
+
+        self._request_refresh(table=True)
+        messagebox.showinfo("Success", f"{count} transactions imported successfully!")
 
     def search_transactions(self, event=None):
+        self.search_after_id = None
         query = self.search_entry.get().strip().lower()
         if not query:
             self.populate_table()
             return
 
-        results = []
-
-        # Detect DATE RANGE: "2024-01-01 to 2024-01-31"
-        if "to" in query:
+        # Detect DATE RANGE: "2024-01-01 to 2024-01-31"; a bare "to" inside
+        # words like "tomato" is an ordinary text search
+        parts = query.split(" to ")
+        if len(parts) == 2 and parts[0][:1].isdigit():
             try:
-                start, end = [q.strip() for q in query.split("to")]
+                start, end = [q.strip() for q in parts]
                 start_date = datetime.strptime(start, "%Y-%m-%d").date()
                 end_date = datetime.strptime(end, "%Y-%m-%d").date()
-
-                for tr in self.fm.get_transactions():
-                    tr_date = datetime.strptime(tr.date, "%Y-%m-%d").date()
-                    if start_date <= tr_date <= end_date:
-                        results.append(tr)
-
-            except:
+            except ValueError:
                 messagebox.showerror("Error", "Invalid date range format.\nUse: YYYY-MM-DD to YYYY-MM-DD")
                 return
 
+            start, end = start_date.isoformat(), end_date.isoformat()
+            self._start_paging(
+                lambda offset, limit: self.fm.search_transactions(
+                    start_date=start, end_date=end, limit=limit, offset=offset
+                )
+            )
+
         else:
-            # Try AMOUNT
+            # Try AMOUNT; "nan"/"inf" parse as floats but are plain text here
             try:
                 amount_num = float(query)
-            except:
+            except ValueError:
+                amount_num = None
+            if amount_num is not None and not math.isfinite(amount_num):
                 amount_num = None
 
-            for tr in self.fm.get_transactions():
-                if (
-                    (amount_num is not None and tr.amount == amount_num) or
-                    (query in tr.type.lower()) or
-                    (query in tr.remarks.lower()) or
-                    (query in tr.date.lower())
-                ):
-                    results.append(tr)
-
-        # Display the results
-        for row in self.table.get_children():
-            self.table.delete(row)
-
-        for tr in results:
-            self.table.insert("", tk.END,
-                values=(tr.id, tr.amount, tr.type, tr.remarks, tr.date, tr.created_at)
-            )
+            index = self._search_index
+            if amount_num is None and index is not None and query.startswith(index[0]):
+                # Every match for the longer query also matched the previous one.
+                # The fields are pre-joined, so each row costs a single
+                # substring test
+                entries = [entry for entry in index[1] if query in entry[1]]
+                self._fill_table([entry[0] for entry in entries])
+                self._page_loader = None
+            else:
+                page = self._start_paging(
+                    lambda offset, limit: self.fm.search_transactions(
+                        text=query, amount=amount_num, limit=limit, offset=offset
+                    )
+                )
+                # A failed search is not an empty result; never cache it
+                if page is None:
+                    return
+                entries = [
+                    (tr, "\0".join((tr.remarks, tr.type, tr.date)).lower())
+                    for tr in page
+                ]
+
+            # Only a complete result set can be narrowed by the next keystroke
+            if self._page_loader is None:
+                self._search_index = (query, entries)
 
     def on_search_key(self, event):
         if self.search_after_id:
             self.root.after_cancel(self.search_after_id)
 
         # wait 300ms after last key stroke
-        self.search_after_id = self.root.after(300, self.search_transactions)
+        q = self.search_entry.get()
+        self.search_after_id = self.root.after(300, lambda q=q: self._maybe_search(q))
+
+    def _maybe_search(self, q):
+        # The text changed since this run was scheduled; a newer one is pending
+        if self.search_entry.get() != q:
+            self.search_after_id = None
+            return
+        self.search_transactions()
 
 
 if __name__ == "__main__":